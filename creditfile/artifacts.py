@@ -0,0 +1,88 @@
+# Created 2026-10-19
+
+
+from collections import namedtuple
+from importlib_resources import files, as_file
+import joblib
+import lightgbm as lgb
+import os
+import threading
+
+
+# Constants
+RESOURCE_LOC = files(__package__)
+ARTIFACT_FILES = {
+    'classifier': 'artifacts/model.txt',
+    'scaler': 'artifacts/score-scaler.pickle',
+    'bow': 'artifacts/bow.pickle'
+}
+ArtifactSet = namedtuple(
+    'ArtifactSet', ['version', 'classifier', 'scaler', 'bow', 'used_features']
+)
+
+
+# Loading
+def split_features(classifier) -> frozenset:
+    'Names of the features the model actually splits on.'
+    return frozenset(
+        name for name, n_splits in zip(
+            classifier.feature_name(),
+            classifier.feature_importance(importance_type='split')
+        )
+        if n_splits > 0
+    )
+
+def artifact_version(artifact_files=ARTIFACT_FILES) -> tuple:
+    'Version stamp of the artifact files from their mtimes and sizes.'
+    version = []
+    for name, loc in artifact_files.items():
+        with as_file(RESOURCE_LOC.joinpath(loc)) as eml:
+            stat = os.stat(eml)
+        version.append((name, stat.st_mtime_ns, stat.st_size))
+    return tuple(version)
+
+def load_artifacts(artifact_files=ARTIFACT_FILES) -> ArtifactSet:
+    'Load a full set of model artifacts.'
+    version = artifact_version(artifact_files)
+    with as_file(RESOURCE_LOC.joinpath(artifact_files['classifier'])) as eml:
+        classifier = lgb.Booster(model_file=eml)
+    with as_file(RESOURCE_LOC.joinpath(artifact_files['scaler'])) as eml:
+        scaler = joblib.load(eml)
+    with as_file(RESOURCE_LOC.joinpath(artifact_files['bow'])) as eml:
+        bow = joblib.load(eml)
+    return ArtifactSet(
+        version, classifier, scaler, bow, split_features(classifier)
+    )
+
+
+# Process-wide artifacts
+# Loaded once in the parent; forked workers inherit its copy, shared
+# copy-on-write. Workers never reload: the parent refreshes between batches
+# and re-forks its workers when the set changes (see batch.analyze_files).
+_current = None
+_lock = threading.Lock()
+
+def get_artifacts() -> ArtifactSet:
+    'Get the loaded artifacts, loading them on first use.'
+    global _current
+    if _current is None:
+        with _lock:
+            if _current is None:
+                _current = load_artifacts()
+    return _current
+
+def refresh_artifacts() -> ArtifactSet:
+    '''Reload the artifacts if their files changed.
+
+    The new set is swapped in only once fully loaded, so callers holding
+    the previous set keep a consistent model, scaler and vectorizer.
+    Replace artifact files with os.replace to avoid reading partial writes.
+    '''
+    global _current
+    current = get_artifacts()
+    if artifact_version() != current.version:
+        with _lock:
+            if artifact_version() != _current.version:
+                _current = load_artifacts()
+            current = _current
+    return current
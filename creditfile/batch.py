@@ -0,0 +1,342 @@
+# Created 2026-10-19
+
+
+from .utils import notna, content_hash
+from .artifacts import get_artifacts, refresh_artifacts
+from .parse import parse_credit_report, is_credit_report, NotCreditReportError
+from .normalize import normalize_credit_data
+from .featurize import prepare_feature_matrix
+from .score import score_normalized
+
+from collections import Counter, deque, namedtuple
+from contextlib import suppress
+from multiprocessing.connection import wait
+import gc
+import json
+import multiprocessing as mp
+import os
+import psutil
+import shutil
+import time
+import traceback
+
+
+# Constants
+BATCH_SIZE = 16
+FILE_TIME_BUDGET = 120.0  # seconds
+FILE_MEMORY_BUDGET = 2 * 1024**3  # bytes of worker RSS
+WORKER_RECYCLE_RSS = 1024**3  # bytes of worker RSS
+POLL_INTERVAL = 0.1  # seconds
+FAILURE_LOG = 'failures.jsonl'
+BatchResult = namedtuple('BatchResult', ['index', 'file', 'record', 'failure'])
+
+
+# Batch tasks
+def analyze_file(file, screen=True) -> dict:
+    'Parse and normalize a single credit file, pre-screening it by default.'
+    file = os.fspath(file)
+    if screen and not is_credit_report(file):
+        raise NotCreditReportError(f'Not a credit report: {file}')
+    return normalize_credit_data(parse_credit_report(file))
+
+def score_records(records, monitor=None):
+    'Featurize and score normalized records; gated records get NaN.'
+    if monitor is None:
+        return score_normalized(records)
+    # The monitor tracks every feature, not just those the model uses
+    feature_matrix = prepare_feature_matrix(records)
+    monitor.update(feature_matrix)
+    return score_normalized(records, feature_matrix)
+
+def analyze_batch(files) -> list:
+    '''Analyze and score a batch of files against the loaded artifacts.
+
+    Files rejected by the pre-screen give None records.
+    '''
+    records = []
+    for file in files:
+        try:
+            records.append(analyze_file(file))
+        except NotCreditReportError:
+            records.append(None)
+    accepted = [record for record in records if record is not None]
+    for record, credit_score in zip(accepted, score_records(accepted)):
+        record['credit_score'] = (
+            int(credit_score) if notna(credit_score) else None
+        )
+    return records
+
+
+# Worker pool
+def make_worker_pool(processes=None):
+    '''Fork a worker pool sharing the parent's artifacts copy-on-write.
+
+    Artifacts are loaded before forking and the collector is frozen so
+    the workers' collections do not dirty the shared pages. The parent
+    unfreezes once the workers are forked, so its own garbage is still
+    collected in long-running sessions.
+    '''
+    get_artifacts()
+    gc.freeze()
+    try:
+        return mp.get_context('fork').Pool(processes)
+    finally:
+        gc.unfreeze()
+
+def analyze_files(files, processes=0, batch_size=BATCH_SIZE):
+    '''Analyze and score files in batches, in order.
+
+    With processes (None for all cores), batches run on a forked worker
+    pool; with 0 they run here. Artifacts are only reloaded in this
+    process, between batches. When they change, batches in flight finish
+    on the old set and the pool is re-forked, so the workers share the
+    new set instead of each loading its own.
+    '''
+    files = list(files)
+    batches = [
+        files[i:i+batch_size] for i in range(0, len(files), batch_size)
+    ]
+    if processes == 0:
+        for batch in batches:
+            refresh_artifacts()
+            yield from analyze_batch(batch)
+        return
+    processes = processes or os.cpu_count()
+    artifacts = refresh_artifacts()
+    pool = make_worker_pool(processes)
+    in_flight = deque()
+    try:
+        for batch in batches:
+            if refresh_artifacts() is not artifacts:
+                while in_flight:
+                    yield from in_flight.popleft().get()
+                pool.close()
+                pool.join()
+                artifacts = get_artifacts()
+                pool = make_worker_pool(processes)
+            in_flight.append(pool.apply_async(analyze_batch, (batch,)))
+            # Keep every worker busy while yielding in order
+            if len(in_flight) > 2 * processes:
+                yield from in_flight.popleft().get()
+        while in_flight:
+            yield from in_flight.popleft().get()
+    finally:
+        pool.terminate()
+
+
+# Supervised batches
+def _worker_loop(connection):
+    'Analyze files sent over a pipe until a None task arrives.'
+    while True:
+        task = connection.recv()
+        if task is None:
+            break
+        try:
+            connection.send(('ok', analyze_file(task)))
+        except NotCreditReportError as e:
+            connection.send(('rejected', {'error': str(e)}))
+        except Exception as e:
+            connection.send(('error', {
+                'error': repr(e),
+                'traceback': traceback.format_exc()
+            }))
+
+class _Worker:
+    'A supervised worker process with at most one file in flight.'
+    def __init__(self, context):
+        self.connection, child_connection = context.Pipe()
+        self.process = context.Process(
+            target=_worker_loop, args=(child_connection,), daemon=True
+        )
+        self.process.start()
+        child_connection.close()
+        self.handle = psutil.Process(self.process.pid)
+        self.task = None
+        self.started = None
+
+    def assign(self, task):
+        self.task = task
+        self.started = time.monotonic()
+        self.connection.send(task[1])
+
+    def release(self):
+        task, self.task = self.task, None
+        return task
+
+    def rss(self):
+        try:
+            return self.handle.memory_info().rss
+        except psutil.Error:
+            return 0
+
+    def stop(self, kill=False):
+        if kill:
+            self.process.kill()
+        else:
+            with suppress(OSError):
+                self.connection.send(None)
+        self.process.join(timeout=5)
+        if self.process.is_alive():
+            self.process.kill()
+            self.process.join()
+        self.connection.close()
+
+def make_failure(file, reason, elapsed, rss, **details) -> dict:
+    'Structured record of a file that could not be processed.'
+    failure = {
+        'file': os.fspath(file),
+        'filename': os.path.basename(file),
+        'reason': reason,
+        'elapsed': round(elapsed, 3),
+        'rss': rss,
+        **details
+    }
+    return failure
+
+def quarantine_file(failure, quarantine_dir):
+    'Move a failed file into quarantine and log its failure record.'
+    os.makedirs(quarantine_dir, exist_ok=True)
+    with suppress(OSError):
+        # Same-named files from different folders must not overwrite
+        # each other, so destinations carry the content hash
+        digest = content_hash(failure['file'])
+        prefix = digest[:16]
+        destination = os.path.join(
+            quarantine_dir, f"{prefix}-{failure['filename']}"
+        )
+        suffix = 0
+        while os.path.exists(destination):
+            suffix += 1
+            destination = os.path.join(
+                quarantine_dir, f"{prefix}-{suffix}-{failure['filename']}"
+            )
+        shutil.move(failure['file'], destination)
+        failure['quarantined'] = destination
+    with open(os.path.join(quarantine_dir, FAILURE_LOG), mode='a') as file:
+        file.write(json.dumps(failure) + '\n')
+
+def supervise_files(files, processes=None, time_budget=FILE_TIME_BUDGET,
+                    memory_budget=FILE_MEMORY_BUDGET,
+                    recycle_rss=WORKER_RECYCLE_RSS, quarantine_dir=None):
+    '''Analyze files in isolated workers under per-file budgets.
+
+    Yields unscored BatchResults in completion order. Files exceeding the
+    wall-clock or RSS budget have their worker killed and replaced; files
+    that fail for any reason are quarantined when a directory is given.
+    Files rejected by the pre-screen fail with reason 'rejected' and are
+    left in place. Workers whose RSS exceeds recycle_rss after a file are
+    replaced.
+    '''
+    context = mp.get_context('fork')
+    pending = deque(enumerate(files))
+    workers = [
+        _Worker(context)
+        for _ in range(min(processes or os.cpu_count(), len(pending)))
+    ]
+
+    def fail(worker, reason, **details):
+        index, file = worker.release()
+        failure = make_failure(
+            file, reason, time.monotonic() - worker.started, worker.rss(),
+            **details
+        )
+        if quarantine_dir is not None and reason != 'rejected':
+            quarantine_file(failure, quarantine_dir)
+        return BatchResult(index, file, None, failure)
+
+    def replace(worker):
+        worker.stop(kill=True)
+        workers[workers.index(worker)] = new_worker = _Worker(context)
+        return new_worker
+
+    try:
+        for worker in workers:
+            worker.assign(pending.popleft())
+        while any(worker.task for worker in workers):
+            busy = {
+                worker.connection: worker for worker in workers if worker.task
+            }
+            ready = wait(list(busy), timeout=POLL_INTERVAL)
+            for worker in busy.values():
+                if worker.connection in ready:
+                    try:
+                        status, payload = worker.connection.recv()
+                    except (EOFError, OSError):
+                        yield fail(
+                            worker, 'crashed',
+                            exitcode=worker.process.exitcode
+                        )
+                        worker = replace(worker)
+                    else:
+                        if status == 'ok':
+                            index, file = worker.release()
+                            yield BatchResult(index, file, payload, None)
+                        elif status == 'rejected':
+                            yield fail(worker, 'rejected', **payload)
+                        else:
+                            yield fail(worker, 'error', **payload)
+                        if worker.rss() > recycle_rss:
+                            worker = replace(worker)
+                else:
+                    elapsed = time.monotonic() - worker.started
+                    rss = worker.rss()
+                    if elapsed > time_budget:
+                        yield fail(worker, 'timeout')
+                    elif rss > memory_budget:
+                        yield fail(worker, 'memory')
+                    elif not worker.process.is_alive():
+                        yield fail(
+                            worker, 'crashed',
+                            exitcode=worker.process.exitcode
+                        )
+                    else:
+                        continue
+                    worker = replace(worker)
+                if pending and worker.task is None:
+                    worker.assign(pending.popleft())
+    finally:
+        for worker in workers:
+            worker.stop(kill=worker.task is not None)
+
+def run_batch(files, processes=None, batch_size=BATCH_SIZE, monitor=None,
+              **budgets):
+    '''Analyze and score files with per-file budgets and fault isolation.
+
+    Parsing runs in supervised workers (see supervise_files); successful
+    records are scored here in batches, feeding an optional DriftMonitor.
+    Yields BatchResults.
+    '''
+    buffer = []
+
+    def flush():
+        # Scoring runs here, so artifacts are reloaded here between batches
+        refresh_artifacts()
+        credit_scores = score_records(
+            [result.record for result in buffer], monitor
+        )
+        for result, credit_score in zip(buffer, credit_scores):
+            result.record['credit_score'] = (
+                int(credit_score) if notna(credit_score) else None
+            )
+        yield from buffer
+        buffer.clear()
+
+    for result in supervise_files(files, processes, **budgets):
+        if result.failure is not None:
+            yield result
+            continue
+        buffer.append(result)
+        if len(buffer) >= batch_size:
+            yield from flush()
+    if buffer:
+        yield from flush()
+
+def count_outcomes(results) -> Counter:
+    'Count BatchResults (or journal entries) by outcome: ok or failure reason.'
+    counts = Counter()
+    for result in results:
+        failure = (
+            result['failure'] if isinstance(result, dict) else result.failure
+        )
+        counts['ok' if failure is None else failure['reason']] += 1
+    return counts
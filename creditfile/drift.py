@@ -0,0 +1,171 @@
+# Created 2026-10-19
+
+
+from .artifacts import get_artifacts
+from .featurize import MODEL_FEATURES
+
+import numpy as np
+import pandas as pd
+
+
+# Constants
+N_BINS = 32
+# Bin layout per feature: missing, below range, N_BINS in range, above range
+NAN_BIN, UNDER_BIN, OVER_BIN = 0, 1, N_BINS + 2
+N_SLOTS = N_BINS + 3
+OUT_OF_RANGE_THRESHOLD = 0.05
+PSI_THRESHOLD = 0.25
+PSI_EPSILON = 1e-4
+
+
+# Training ranges
+def training_ranges(classifier=None, features=MODEL_FEATURES) -> np.ndarray:
+    'Per-feature (min, max) seen in training, from the model feature_infos.'
+    if classifier is None:
+        classifier = get_artifacts().classifier
+    feature_infos = classifier.dump_model()['feature_infos']
+    return np.array(
+        [
+            (feature_infos[name]['min_value'], feature_infos[name]['max_value'])
+            for name in features
+        ],
+        dtype=float
+    )
+
+
+# Monitor
+class DriftMonitor:
+    '''Constant-memory histograms of model features against training ranges.
+
+    Each feature is binned on its training range, with extra bins for
+    missing and out-of-range values. Counts only ever add up, so monitors
+    from parallel workers or earlier runs merge by summation.
+    '''
+    def __init__(self, ranges=None, features=MODEL_FEATURES, counts=None):
+        self.features = tuple(features)
+        self.ranges = (
+            training_ranges(features=self.features) if ranges is None
+            else np.asarray(ranges, dtype=float)
+        )
+        self.counts = (
+            np.zeros((len(self.features), N_SLOTS), dtype=np.int64)
+            if counts is None else np.asarray(counts, dtype=np.int64)
+        )
+
+    def __repr__(self):
+        return f'DriftMonitor(n={self.n_rows}, features={len(self.features)})'
+
+    def __add__(self, other):
+        return DriftMonitor(
+            self.ranges, self.features, self.counts.copy()
+        ).merge(other)
+
+    @property
+    def n_rows(self):
+        return int(self.counts[0].sum())
+
+    def update(self, feature_matrix):
+        'Add a batch of feature rows to the histograms.'
+        feature_matrix = np.asarray(feature_matrix, dtype=float)
+        lower, upper = self.ranges[:, 0], self.ranges[:, 1]
+        width = np.where(upper > lower, upper - lower, 1)
+        with np.errstate(invalid='ignore'):
+            slots = 2 + np.clip(
+                np.floor((feature_matrix - lower) / width * N_BINS),
+                0, N_BINS - 1
+            )
+            slots[feature_matrix < lower] = UNDER_BIN
+            slots[feature_matrix > upper] = OVER_BIN
+        slots[np.isnan(feature_matrix)] = NAN_BIN
+        flat = (slots + N_SLOTS * np.arange(len(self.features))).astype(np.int64)
+        self.counts += np.bincount(
+            flat.ravel(), minlength=self.counts.size
+        ).reshape(self.counts.shape)
+        return self
+
+    def merge(self, other):
+        'Fold another monitor with the same ranges into this one.'
+        if self.features != other.features or not np.array_equal(
+            self.ranges, other.ranges
+        ):
+            raise ValueError('Monitors have different features or ranges.')
+        self.counts += other.counts
+        return self
+
+    def quantiles(self, q=(0.05, 0.5, 0.95)) -> pd.DataFrame:
+        'Approximate quantiles; out-of-range values are clamped to the range.'
+        q = np.atleast_1d(q)
+        observed = self.counts[:, UNDER_BIN:]
+        cumulative = np.cumsum(observed, axis=1)
+        total = cumulative[:, -1:]
+        lower, upper = self.ranges[:, :1], self.ranges[:, 1:]
+        # Slot edges: under, N_BINS bins, over collapse onto the range ends
+        edges = np.concatenate([
+            lower, lower + (upper - lower) * np.arange(N_BINS + 1) / N_BINS,
+            upper
+        ], axis=1)
+        values = np.full((len(self.features), len(q)), np.nan)
+        for i in np.flatnonzero(total[:, 0]):
+            targets = q * total[i, 0]
+            slot = np.searchsorted(cumulative[i], targets, side='left')
+            slot = np.minimum(slot, N_SLOTS - 2)
+            start = np.where(slot > 0, cumulative[i, slot - 1], 0)
+            fraction = (targets - start) / np.maximum(observed[i, slot], 1)
+            values[i] = edges[i, slot] + fraction * (
+                edges[i, slot + 1] - edges[i, slot]
+            )
+        return pd.DataFrame(values, index=self.features, columns=q)
+
+    def proportions(self) -> np.ndarray:
+        'Share of rows per slot for each feature.'
+        return self.counts / np.maximum(self.counts.sum(axis=1, keepdims=True), 1)
+
+    def population_stability(self, baseline) -> np.ndarray:
+        'Population stability index of each feature against a baseline.'
+        current = np.maximum(self.proportions(), PSI_EPSILON)
+        reference = np.maximum(baseline.proportions(), PSI_EPSILON)
+        return ((current - reference) * np.log(current / reference)).sum(axis=1)
+
+    def report(self, baseline=None) -> pd.DataFrame:
+        'Per-feature missing, out-of-range and drift rates with flags.'
+        n = self.counts.sum(axis=1)
+        observed = np.maximum(n - self.counts[:, NAN_BIN], 1)
+        report = pd.DataFrame({
+            'n': n,
+            'missing_rate': self.counts[:, NAN_BIN] / np.maximum(n, 1),
+            'below_range_rate': self.counts[:, UNDER_BIN] / observed,
+            'above_range_rate': self.counts[:, OVER_BIN] / observed
+        }, index=self.features)
+        report['out_of_range'] = (
+            report['below_range_rate'] + report['above_range_rate']
+            > OUT_OF_RANGE_THRESHOLD
+        )
+        if baseline is not None:
+            report['psi'] = self.population_stability(baseline)
+            report['drifted'] = report['psi'] > PSI_THRESHOLD
+        return report
+
+    def save(self, path):
+        'Persist the summary as an .npz file.'
+        np.savez(
+            path,
+            features=np.array(self.features),
+            ranges=self.ranges,
+            counts=self.counts
+        )
+
+    @classmethod
+    def load(cls, path):
+        'Load a summary saved with save.'
+        with np.load(path) as summary:
+            return cls(
+                summary['ranges'], summary['features'].tolist(), summary['counts']
+            )
+
+def merge_summaries(paths) -> DriftMonitor:
+    'Merge saved monitor summaries, e.g. from parallel workers.'
+    paths = iter(paths)
+    merged = DriftMonitor.load(next(paths))
+    for path in paths:
+        merged.merge(DriftMonitor.load(path))
+    return merged
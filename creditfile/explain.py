@@ -0,0 +1,96 @@
+# Created 2026-10-19
+
+
+from .featurize import FEATURE_MAP, MODEL_FEATURES
+from .artifacts import get_artifacts
+
+import numpy as np
+
+
+# Constants
+DEFAULT_N_REASONS = 3
+# Intermediate features (see featurize.extract_features) behind each model
+# feature, where they differ from the model feature's own name
+FEATURE_INPUTS = {
+    'num__loan_downpayment': ('loan_terms',),
+    'num__loan_term': ('loan_terms',),
+    'num__monthly_amortization': (
+        'monthly_amortization', 'loan_amount', 'loan_terms'
+    ),
+    'num__n_dependents': ('n_dependents', 'dependent_ages'),
+    'num__n_dependents_corrected': ('dependent_ages',),
+    'num__loan_downpayment_ratio': ('loan_terms', 'loan_amount'),
+    'num__amort_income_ratio': (
+        'monthly_amortization', 'gross_income', 'loan_amount', 'loan_terms'
+    )
+}
+
+
+# Feature provenance
+def invert_feature_map(feature_map=FEATURE_MAP, prefix=()) -> dict:
+    'Map intermediate feature names to their normalized field paths.'
+    sources = {}
+    if isinstance(feature_map, dict):
+        for parent, child in feature_map.items():
+            sources.update(invert_feature_map(child, (*prefix, parent)))
+    elif isinstance(feature_map, list):
+        for field_name, feature_name in feature_map:
+            sources[feature_name] = '__'.join((*prefix, field_name))
+    elif isinstance(feature_map, str):
+        sources[feature_map] = '__'.join(prefix)
+    return sources
+
+def model_feature_sources(model_features=MODEL_FEATURES) -> tuple:
+    'Normalized field paths behind each model feature.'
+    sources = invert_feature_map()
+    feature_sources = []
+    for feature in model_features:
+        if feature.startswith('bow__'):
+            inputs = ('motorcycle_model',)
+        else:
+            inputs = FEATURE_INPUTS.get(feature, (feature.split('__', 1)[1],))
+        feature_sources.append(tuple(sources[x] for x in inputs))
+    return tuple(feature_sources)
+
+FEATURE_SOURCES = model_feature_sources()
+
+
+# Reason codes
+def explain_credit_scores(feature_matrix, k=DEFAULT_N_REASONS) -> dict:
+    'Top-k adverse feature contributions per row of a feature matrix.'
+    feature_matrix = np.asarray(feature_matrix, dtype=float)
+    n_rows = len(feature_matrix)
+    k = min(k, len(MODEL_FEATURES))
+    if not n_rows:
+        return {
+            'features': np.empty((0, k), dtype=np.int16),
+            'contributions': np.empty((0, k), dtype=np.float32),
+            'base_value': np.nan
+        }
+    contributions = get_artifacts().classifier.predict(
+        feature_matrix, pred_contrib=True
+    )
+    contributions = contributions.reshape(n_rows, len(MODEL_FEATURES) + 1)
+    base_values, contributions = contributions[:, -1], contributions[:, :-1]
+    # Positive contributions raise the delinquency score
+    top = np.argpartition(-contributions, k-1, axis=1)[:, :k]
+    top_contributions = np.take_along_axis(contributions, top, axis=1)
+    order = np.argsort(-top_contributions, axis=1)
+    top = np.take_along_axis(top, order, axis=1)
+    top_contributions = np.take_along_axis(top_contributions, order, axis=1)
+    adverse = top_contributions > 0
+    reasons = {
+        'features': np.where(adverse, top, -1).astype(np.int16),
+        'contributions': (
+            np.where(adverse, top_contributions, 0).astype(np.float32)
+        ),
+        'base_value': base_values[0]
+    }
+    return reasons
+
+def reason_names(reason_features, names=MODEL_FEATURES) -> np.ndarray:
+    'Look up names for reason feature indices; -1 maps to None.'
+    lookup = np.empty(len(names) + 1, dtype=object)
+    for i, name in enumerate(names):
+        lookup[i] = name
+    return lookup[np.asarray(reason_features)]
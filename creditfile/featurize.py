@@ -1,11 +1,18 @@
 # Created 2023-10-23
 
 
-from .utils import notna, isna, force_numeric, normalize_text
+from .utils import (
+    notna,
+    isna,
+    force_numeric,
+    normalize_text,
+    force_numeric_array,
+    normalize_text_array,
+    notna_mask
+)
 from .loancalc import Loan
+from .artifacts import get_artifacts
 
-from importlib_resources import files, as_file
-import joblib
 import numpy as np
 import pandas as pd
 import re
@@ -15,6 +22,7 @@ import re
 NULL_VALUE = float('nan')
 MIN_AGE, MAX_AGE = 0, 80
 MAX_DEPENDENT_AGE = 21
+AMORTIZATION_INTEREST = 0.039881
 FEATURE_MAP = {
     'filename': 'info__filename',
     'last_modified': 'info__last_modified',
@@ -85,13 +93,23 @@ MODEL_FEATURES = (
     'num__loan_downpayment_ratio',
     'num__amort_income_ratio'
 )
+ALL_FEATURES = frozenset(MODEL_FEATURES)
+# Model features computed from other model features
+FEATURE_DEPENDENCIES = {
+    'num__monthly_amortization': ('num__loan_amount', 'num__loan_term'),
+    'num__amort_income_ratio': (
+        'num__monthly_amortization', 'num__gross_income'
+    ),
+    'num__loan_downpayment_ratio': ('num__loan_downpayment', 'num__loan_amount')
+}
 
 
 # Artifacts
-# bow = joblib.load('artifacts/bow.pickle')
-RESOURCE_LOC = files(__package__)
-with as_file(RESOURCE_LOC.joinpath('artifacts/bow.pickle')) as eml:
-    bow = joblib.load(eml)
+def __getattr__(name):
+    # Keeps featurize.bow pointing at the current artifact set
+    if name == 'bow':
+        return get_artifacts().bow
+    raise AttributeError(f'module {__name__!r} has no attribute {name!r}')
 
 
 # Feature processing
@@ -199,6 +217,7 @@ def encode_marital_status(val):
 
 def prepare_demographics(features):
     'Prepare demographic features.'
+    bow = get_artifacts().bow
     demographics = {
         **dict(zip(
             ('bow__' + name for name in bow.get_feature_names_out()),
@@ -238,7 +257,7 @@ def expand_loan_terms(val):
     }
     return loan_terms
 
-def impute_amortization(features, interest=0.039881):
+def impute_amortization(features, interest=AMORTIZATION_INTEREST):
     'Derive missing monthly amortization from loan terms.'
     for_imputation = (
         isna(features['monthly_amortization'])
@@ -291,4 +310,137 @@ def prepare_features(normalized):
     financials = prepare_financials(features)
     features = demographics | financials
     features = [features[k] for k in MODEL_FEATURES]
-    return features
\ No newline at end of file
+    return features
+
+
+# Batch feature preparation
+def apply_unique(fun, values) -> np.ndarray:
+    'Apply a scalar function once per distinct value; nulls share one call.'
+    codes, uniques = pd.factorize(pd.Series(values, dtype=object))
+    results = np.empty(len(uniques) + 1, dtype=object)
+    for i, val in enumerate(uniques):
+        results[i] = fun(val)
+    results[-1] = fun(NULL_VALUE)
+    return results[codes]
+
+CATEGORICAL_ENCODERS = {
+    'cat__housing_status': (encode_housing_status, 'housing_status'),
+    'cat__marital_status': (encode_marital_status, 'marital_status'),
+    'cat__education': (encode_education, 'education'),
+    'cat__spouse_education': (encode_education, 'spouse_education')
+}
+
+def resolve_features(features=None) -> frozenset:
+    'Close a set of model features over the features they are derived from.'
+    resolved = set(MODEL_FEATURES if features is None else features)
+    pending = list(resolved)
+    while pending:
+        for dependency in FEATURE_DEPENDENCIES.get(pending.pop(), ()):
+            if dependency not in resolved:
+                resolved.add(dependency)
+                pending.append(dependency)
+    return frozenset(resolved)
+
+def feature_columns(features) -> np.ndarray:
+    'Column indices of features in the feature matrix.'
+    return np.array(
+        [i for i, k in enumerate(MODEL_FEATURES) if k in features], dtype=int
+    )
+
+def prepare_demographics_batch(frame, needed=ALL_FEATURES) -> dict:
+    'Batch counterpart of prepare_demographics for the needed features.'
+    demographics = {}
+    if any(k.startswith('bow__') for k in needed):
+        bow = get_artifacts().bow
+        motorcycle_models = normalize_text_array(frame['motorcycle_model'])
+        motorcycle_models[~notna_mask(motorcycle_models)] = ''
+        bow_counts = bow.transform(motorcycle_models).toarray()
+        demographics.update({
+            'bow__' + name: bow_counts[:, i]
+            for i, name in enumerate(bow.get_feature_names_out())
+        })
+    if 'num__age' in needed:
+        age = force_numeric_array(frame['age'])
+        with np.errstate(invalid='ignore'):
+            age[~((MIN_AGE <= age) & (age <= MAX_AGE))] = NULL_VALUE
+        demographics['num__age'] = age
+    if 'num__n_children' in needed:
+        demographics['num__n_children'] = force_numeric_array(frame['n_children'])
+    if needed & {'num__n_dependents', 'num__n_dependents_corrected'}:
+        dependent_counts = pd.DataFrame.from_records([
+            correct_dependent_counts({'dependent_ages': ages, 'n_dependents': n})
+            for ages, n in zip(frame['dependent_ages'], frame['n_dependents'])
+        ])
+        demographics.update({
+            'num__' + k: dependent_counts[k].to_numpy(float)
+            for k in ('n_dependents', 'n_dependents_corrected')
+        })
+    for k, (encoder, feature) in CATEGORICAL_ENCODERS.items():
+        if k in needed:
+            demographics[k] = apply_unique(encoder, frame[feature])
+    return demographics
+
+def prepare_financials_batch(frame, needed=ALL_FEATURES,
+                             interest=AMORTIZATION_INTEREST) -> dict:
+    'Batch counterpart of prepare_financials for the needed features.'
+    needed = {k[len('num__'):] for k in needed if k.startswith('num__')}
+    financial_features = (
+        'loan_amount', 'monthly_amortization', 'gross_income',
+        'employment_income', 'business_income', 'spouse_income'
+    )
+    financials = {
+        k: force_numeric_array(frame[k]) for k in financial_features
+        if k in needed
+    }
+    if 'gross_income' in financials:
+        financials['gross_income'][financials['gross_income'] == 0] = NULL_VALUE
+    if needed & {'loan_term', 'loan_downpayment'}:
+        loan_terms = apply_unique(expand_loan_terms, frame['loan_terms'])
+        for k in ('loan_term', 'loan_downpayment'):
+            financials[k] = np.array(
+                [terms[k] for terms in loan_terms], dtype=float
+            )
+    if 'monthly_amortization' in needed:
+        for_imputation = (
+            np.isnan(financials['monthly_amortization'])
+            & ~np.isnan(financials['loan_amount'])
+            & ~np.isnan(financials['loan_term'])
+        )
+        financials['monthly_amortization'][for_imputation] = (
+            Loan.amort_calculator(
+                financials['loan_amount'][for_imputation],
+                interest,
+                financials['loan_term'][for_imputation]
+            )
+        )
+    with np.errstate(divide='ignore', invalid='ignore'):
+        if 'amort_income_ratio' in needed:
+            financials['amort_income_ratio'] = (
+                financials['monthly_amortization'] / financials['gross_income']
+            )
+        if 'loan_downpayment_ratio' in needed:
+            financials['loan_downpayment_ratio'] = (
+                financials['loan_downpayment'] / financials['loan_amount']
+            )
+    return {'num__' + k: v for k, v in financials.items()}
+
+def prepare_feature_matrix(records, features=None) -> np.ndarray:
+    '''Prepare an (n_records x n_features) matrix for a batch.
+
+    With features given, only those (and what they derive from) are
+    computed; the other columns are NaN.
+    '''
+    if not len(records):
+        return np.empty((0, len(MODEL_FEATURES)))
+    needed = resolve_features(features)
+    frame = pd.DataFrame.from_records([
+        extract_features(FEATURE_MAP, normalized) for normalized in records
+    ])
+    columns = (
+        prepare_demographics_batch(frame, needed)
+        | prepare_financials_batch(frame, needed)
+    )
+    not_computed = np.full(len(records), NULL_VALUE)
+    return np.column_stack(
+        [columns.get(k, not_computed) for k in MODEL_FEATURES]
+    ).astype(float)
@@ -0,0 +1,78 @@
+# Created 2026-10-19
+
+
+import mmap
+import numpy as np
+import os
+import pandas as pd
+import struct
+
+
+# Constants
+MAGIC = b'CFGRID01'
+# magic, n_rows, n_cols, n_strings, blob size
+HEADER = struct.Struct('<8sQQQQ')
+GRID_SUFFIX = '.grid'
+
+
+# Grid serialization
+def _aligned(offset, alignment=8) -> int:
+    return -(-offset // alignment) * alignment
+
+def save_grid(report_sheet, path):
+    '''Save a string grid as cell codes into a string table.
+
+    Layout: header, int32 cell codes (-1 for null), int64 string offsets,
+    utf-8 string blob. Written to a temporary file and renamed into place.
+    '''
+    codes, uniques = pd.factorize(report_sheet.to_numpy(dtype=object).ravel())
+    encoded = [str(string).encode('utf-8') for string in uniques]
+    offsets = np.zeros(len(encoded) + 1, dtype=np.int64)
+    np.cumsum([len(string) for string in encoded], out=offsets[1:])
+    n_rows, n_cols = report_sheet.shape
+    codes_start = HEADER.size
+    offsets_start = _aligned(codes_start + 4 * codes.size)
+    temp_path = f'{path}.{os.getpid()}.tmp'
+    with open(temp_path, mode='wb') as file:
+        file.write(HEADER.pack(
+            MAGIC, n_rows, n_cols, len(encoded), int(offsets[-1])
+        ))
+        file.write(codes.astype(np.int32).tobytes())
+        file.write(b'\0' * (offsets_start - codes_start - 4 * codes.size))
+        file.write(offsets.tobytes())
+        file.write(b''.join(encoded))
+    os.replace(temp_path, path)
+
+def load_grid(path) -> pd.DataFrame:
+    'Load a grid saved with save_grid.'
+    with open(path, mode='rb') as file, mmap.mmap(
+        file.fileno(), 0, access=mmap.ACCESS_READ
+    ) as buffer:
+        magic, n_rows, n_cols, n_strings, blob_size = HEADER.unpack_from(buffer)
+        if magic != MAGIC:
+            raise ValueError(f'Not a grid cache file: {path}')
+        n_cells = n_rows * n_cols
+        codes_start = HEADER.size
+        offsets_start = _aligned(codes_start + 4 * n_cells)
+        blob_start = offsets_start + 8 * (n_strings + 1)
+        codes = np.frombuffer(
+            buffer, dtype=np.int32, count=n_cells, offset=codes_start
+        )
+        offsets = np.frombuffer(
+            buffer, dtype=np.int64, count=n_strings + 1, offset=offsets_start
+        ).tolist()
+        blob = buffer[blob_start:blob_start + blob_size]
+        # Last slot holds the null that -1 codes index into
+        strings = np.empty(n_strings + 1, dtype=object)
+        strings[:-1] = [
+            blob[start:end].decode('utf-8')
+            for start, end in zip(offsets, offsets[1:])
+        ]
+        strings[-1] = np.nan
+        cells = strings[codes].reshape(n_rows, n_cols)
+        del codes
+    return pd.DataFrame(cells)
+
+def grid_path(cache_dir, digest) -> str:
+    'Cache location of the grid for a content hash.'
+    return os.path.join(cache_dir, digest[:2], digest + GRID_SUFFIX)
@@ -0,0 +1,219 @@
+# Created 2026-10-19
+
+
+from .utils import notna, normalize_text
+
+from contextlib import suppress
+from datetime import datetime
+from difflib import SequenceMatcher
+import re
+import sqlite3
+
+
+# Constants
+MIN_NAME_SIMILARITY = 0.85
+CONTACT_DIGITS = 10
+# Date formats after normalize_text; numeric dates are month first
+DOB_FORMATS = (
+    '%Y %m %d %H%M%S',
+    '%Y %m %d',
+    '%m %d %Y',
+    '%m %d %y',
+    '%b %d %Y',
+    '%B %d %Y',
+    '%d %b %Y',
+    '%d %B %Y'
+)
+COLUMNS = (
+    'applicant_key',
+    'name_key',
+    'dob_key',
+    'contact_key',
+    'filename',
+    'last_modified',
+    'date_applied',
+    'credit_score',
+    'name_token'
+)
+SCHEMA = '''
+CREATE TABLE IF NOT EXISTS applicants (
+    applicant_key TEXT NOT NULL,
+    name_key TEXT NOT NULL,
+    dob_key TEXT NOT NULL,
+    contact_key TEXT NOT NULL,
+    filename TEXT NOT NULL,
+    last_modified TEXT,
+    date_applied TEXT,
+    credit_score REAL,
+    name_token TEXT NOT NULL DEFAULT '',
+    PRIMARY KEY (applicant_key, filename)
+);
+CREATE INDEX IF NOT EXISTS applicants_dob ON applicants (dob_key);
+CREATE INDEX IF NOT EXISTS applicants_contact ON applicants (contact_key);
+'''
+NAME_INDEX = (
+    'CREATE INDEX IF NOT EXISTS applicants_name ON applicants (name_token)'
+)
+
+
+# Key construction
+def make_name_key(name):
+    'Order-insensitive name key, e.g. "Dela Cruz, Juan" == "Juan Dela Cruz".'
+    if not isinstance(name, str):
+        return ''
+    return ' '.join(sorted(normalize_text(name).split()))
+
+def make_dob_key(dob):
+    'ISO date of birth key, or the normalized text of an unknown format.'
+    if not isinstance(dob, str):
+        return ''
+    normalized = normalize_text(dob)
+    for date_format in DOB_FORMATS:
+        with suppress(ValueError):
+            dob_date = datetime.strptime(normalized, date_format).date()
+            return dob_date.isoformat()
+    return normalized
+
+def make_contact_key(contact_no):
+    'Last digits of the normalized contact number.'
+    if not isinstance(contact_no, str):
+        return ''
+    return re.sub(r'[^0-9]', '', normalize_text(contact_no))[-CONTACT_DIGITS:]
+
+def make_applicant_keys(personal_data) -> dict:
+    'Build the exact and blocking keys for an applicant.'
+    keys = {
+        'name_key': make_name_key(personal_data.get('name')),
+        'dob_key': make_dob_key(personal_data.get('dob')),
+        'contact_key': make_contact_key(personal_data.get('contact_no'))
+    }
+    keys['applicant_key'] = '|'.join(
+        keys[k] for k in ('name_key', 'dob_key', 'contact_key')
+    )
+    # First token of the sorted name, to block on when nothing else is known
+    keys['name_token'] = keys['name_key'].split(' ', 1)[0]
+    return keys
+
+
+# Index
+class ApplicantIndex:
+    'Persistent SQLite index of applicants across credit files.'
+    def __init__(self, path=':memory:'):
+        self.path = path
+        self.connection = sqlite3.connect(path)
+        self.connection.row_factory = sqlite3.Row
+        self.connection.executescript(SCHEMA)
+        self._migrate()
+        self.connection.execute(NAME_INDEX)
+
+    def __repr__(self):
+        return f'ApplicantIndex(path={self.path!r})'
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+    def __len__(self):
+        return self.connection.execute(
+            'SELECT COUNT(*) FROM applicants'
+        ).fetchone()[0]
+
+    def close(self):
+        self.connection.close()
+
+    def _migrate(self):
+        'Rekey indexes created before name blocking and ISO birth dates.'
+        columns = {
+            row['name'] for row in
+            self.connection.execute('PRAGMA table_info(applicants)')
+        }
+        if 'name_token' in columns:
+            return
+        with self.connection:
+            self.connection.execute(
+                'ALTER TABLE applicants '
+                'ADD COLUMN name_token TEXT NOT NULL DEFAULT \'\''
+            )
+            rows = self.connection.execute(
+                'SELECT rowid, name_key, dob_key, contact_key FROM applicants'
+            ).fetchall()
+            # Stored keys are normalized text, which the key makers accept
+            for row in rows:
+                keys = make_applicant_keys({
+                    'name': row['name_key'],
+                    'dob': row['dob_key'],
+                    'contact_no': row['contact_key']
+                })
+                self.connection.execute(
+                    'UPDATE OR REPLACE applicants SET applicant_key = ?, '
+                    'dob_key = ?, name_token = ? WHERE rowid = ?',
+                    (keys['applicant_key'], keys['dob_key'],
+                     keys['name_token'], row['rowid'])
+                )
+
+    def add(self, normalized, credit_score=None):
+        'Index a normalized credit file.'
+        self.add_many([(normalized, credit_score)])
+
+    def add_many(self, records):
+        'Index (normalized, credit_score) pairs in a single transaction.'
+        rows = []
+        for normalized, credit_score in records:
+            personal_data = normalized.get('personal_data', {})
+            keys = make_applicant_keys(personal_data)
+            if not keys['name_key']:
+                continue
+            rows.append((
+                keys['applicant_key'],
+                keys['name_key'],
+                keys['dob_key'],
+                keys['contact_key'],
+                normalized['filename'],
+                normalized.get('last_modified'),
+                personal_data.get('date_applied'),
+                credit_score if notna(credit_score) else None,
+                keys['name_token']
+            ))
+        with self.connection:
+            self.connection.executemany(
+                f'INSERT OR REPLACE INTO applicants ({", ".join(COLUMNS)}) '
+                f'VALUES ({", ".join("?" * len(COLUMNS))})',
+                rows
+            )
+
+    def lookup(self, personal_data, fuzzy=False,
+               min_similarity=MIN_NAME_SIMILARITY) -> list:
+        'Find prior files of an applicant, most recent first.'
+        keys = make_applicant_keys(personal_data)
+        if not keys['name_key']:
+            return []
+        if not fuzzy:
+            # A bare name is not enough to identify an applicant
+            if not (keys['dob_key'] or keys['contact_key']):
+                return []
+            rows = self.connection.execute(
+                'SELECT * FROM applicants WHERE applicant_key = ?',
+                (keys['applicant_key'],)
+            ).fetchall()
+            matches = [dict(row) | {'similarity': 1.0} for row in rows]
+        else:
+            # Block on date of birth, contact number or a name token, then
+            # compare names
+            rows = self.connection.execute(
+                'SELECT * FROM applicants '
+                'WHERE (dob_key = ? AND dob_key != \'\') '
+                'OR (contact_key = ? AND contact_key != \'\') '
+                'OR name_token = ?',
+                (keys['dob_key'], keys['contact_key'], keys['name_token'])
+            ).fetchall()
+            matches = []
+            for row in rows:
+                similarity = SequenceMatcher(
+                    None, keys['name_key'], row['name_key']
+                ).ratio()
+                if similarity >= min_similarity:
+                    matches.append(dict(row) | {'similarity': similarity})
+        matches.sort(key=lambda x: x['last_modified'] or '', reverse=True)
+        return matches
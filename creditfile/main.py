@@ -1,78 +1,32 @@
 # Created 2023-10-20
 
 
-from .utils import isna
-from .parse import get_file_details, parse_credit_report
-from .normalize import normalize_credit_data
-from .featurize import prepare_features
-from .score import make_credit_score
+from .utils import isna, notna
+from .validate import (
+    ESSENTIAL_FIELDS,
+    MAX_MISSING_FEATURES,
+    is_missing,
+    validate_fields,
+    missing_matrix,
+    count_missing_features
+)
+from .artifacts import get_artifacts
+from .featurize import prepare_feature_matrix, feature_columns
+from .score import score_normalized
+from .parse import NotCreditReportError
+from .batch import analyze_file, make_worker_pool
+from .index import ApplicantIndex
 
-from collections.abc import Iterable
 from google.colab import files
 import ipywidgets as widgets
 from IPython.display import display
 import json
-
-
-# Constants
-ESSENTIAL_FIELDS = {
-    'personal_data': [
-        'name',
-        'present_address',
-        'present_address_tenure',
-        'contact_no',
-        'birthplace',
-        'education',
-        'parents_name',
-        'parents_address',
-        'date_applied',
-        'unit_applied',
-        'loan_amount',
-        'loan_terms',
-        'housing_status',
-        'dob',
-        'age',
-        'marital_status',
-        'n_children',
-        'n_dependents',
-        'dependent_ages'
-    ],
-    'income_analysis': {
-        'summary': ['gross_income', 'monthly_amortization']
-    },
-    'officer_assessment': [
-        'loan_purpose',
-        'unit_payor',
-        'unit_rider',
-        'rider_license',
-        'cell_signal_status',
-        'prepared_by',
-        'remarks'
-    ]
-}
+import os
+import pandas as pd
+import zipfile
 
 
 # Utils
-def is_missing(x):
-    return isna(x) or (isinstance(x, Iterable) and all(isna(_) for _ in x))
-
-def validate_fields(data, essential_fields=ESSENTIAL_FIELDS):
-    'Check if the data contains all essential fields.'
-    missing_fields = {}
-    for k, v in essential_fields.items():
-        subset = data.get(k, None)
-        if isna(subset):
-            missing_fields[k] = v
-        elif isinstance(v, dict):
-            missing = validate_fields(subset, v)
-        elif isinstance(v, list):
-            missing = [
-                field for field in v if isna(subset.get(field, None))
-            ]
-        if missing:
-            missing_fields[k] = missing
-    return missing_fields
-
 def pretty_print(data, level=0, null_repr='NULL'):
     'Pretty print a data container.'
     indentation = '    ' * level
@@ -103,24 +57,41 @@ def print_missing(normalized):
         print()
         print('    None')
 
+def print_prior_files(prior_files):
+    'Print earlier credit files of the same applicant.'
+    print('PRIOR CREDIT FILES', end='')
+    if prior_files:
+        print()
+        for prior in prior_files:
+            print(
+                f"    {prior['filename']} ({prior['last_modified']})"
+                f": {prior['credit_score']}"
+            )
+    else:
+        print()
+        print('    None')
+
 
 # Report analysis
-def analyze_upload():
-    'Upload and analyze a credit file.'
-    upload = files.upload()
-    fn, report = next(iter(upload.items()))
-    parsed = get_file_details(fn) | parse_credit_report(report)
-    normalized = normalize_credit_data(parsed)
-    features = prepare_features(normalized)
-    missing_count = sum(1 for _ in features if isna(_) or _ == -1)
-    score = make_credit_score(features)
+def analyze_uploaded_file(fn):
+    'Parse and normalize an uploaded file, capturing any error.'
+    try:
+        return fn, analyze_file(fn), None
+    except NotCreditReportError:
+        return fn, None, 'Not a credit report'
+    except Exception as e:
+        return fn, None, repr(e)
 
-    # Printing info
+def print_report_details(normalized, score, missing_count, prior_files=None):
+    'Print the validation details of a single credit file.'
     print()
     print_missing(normalized)
     print()
-    if missing_count < 5:
-        print(f'CREDIT SCORE: {score}')
+    if prior_files is not None:
+        print_prior_files(prior_files)
+        print()
+    if missing_count < MAX_MISSING_FEATURES:
+        print(f'CREDIT SCORE: {int(score)}')
     else:
         print(f'CREDIT SCORE: Too many missing data fields.')
     print()
@@ -128,16 +99,96 @@ def analyze_upload():
     pretty_print(normalized)
     print()
 
+def analyze_upload(index_path=None, processes=None):
+    'Upload and analyze credit files.'
+    upload = files.upload()
+    fns = list(upload)
+    if not fns:
+        return
+
+    # Parsing in a worker pool
+    progress = widgets.IntProgress(
+        value=0, min=0, max=len(fns), description='Analyzing'
+    )
+    display(progress)
+    analyzed, errors = {}, {}
+    with make_worker_pool(min(processes or os.cpu_count(), len(fns))) as pool:
+        for fn, normalized, error in pool.imap_unordered(
+            analyze_uploaded_file, fns
+        ):
+            if error is None:
+                analyzed[fn] = normalized
+            else:
+                errors[fn] = error
+            progress.value += 1
+    progress.bar_style = 'success' if not errors else 'warning'
+    n_rejected = list(errors.values()).count('Not a credit report')
+    if n_rejected:
+        print(f'Skipped {n_rejected} of {len(fns)} files: not credit reports.')
+
+    # Batch scoring
+    fns = [fn for fn in fns if fn in analyzed]
+    records = [analyzed[fn] for fn in fns]
+    # Gate on the model's own features, as the batch and stream paths do
+    feature_matrix = prepare_feature_matrix(records)
+    missing_counts = count_missing_features(
+        feature_matrix, feature_columns(get_artifacts().used_features)
+    )
+    scores = score_normalized(records, feature_matrix)
+    missing_fields = missing_matrix(records).sum(axis=1).to_numpy()
+    prior_files = {}
+    if index_path is not None:
+        with ApplicantIndex(index_path) as index:
+            for fn, normalized in zip(fns, records):
+                prior_files[fn] = [
+                    prior for prior in index.lookup(
+                        normalized['personal_data'], fuzzy=True
+                    )
+                    if prior['filename'] != normalized['filename']
+                ]
+            index.add_many(zip(records, scores))
+
+    # Printing info
+    if len(fns) == 1 and not errors:
+        print_report_details(
+            records[0], scores[0], missing_counts[0],
+            prior_files.get(fns[0])
+        )
+    summary = pd.DataFrame({
+        'file': fns + list(errors),
+        'credit_score': [
+            int(score) if missing_count < MAX_MISSING_FEATURES
+            else 'Too many missing data fields'
+            for score, missing_count in zip(scores, missing_counts)
+        ] + [f'Error: {error}' for error in errors.values()],
+        'missing_fields': [*missing_fields, *[None] * len(errors)],
+        'missing_features': [*missing_counts, *[None] * len(errors)]
+    })
+    if index_path is not None:
+        summary['prior_files'] = [
+            len(prior_files[fn]) if fn in prior_files else None
+            for fn in summary['file']
+        ]
+    print('SUMMARY')
+    display(summary)
+
     # Exporting normalized data
     def on_button_click(b):
-        normalized['credit_score'] = score
-        output_fn = fn.rsplit('.', maxsplit=1)[0] + '.json'
-        with open(output_fn, mode='w') as file:
-            json.dump(normalized, file, indent=4)
+        output_fn = 'validated_credit_files.zip'
+        with zipfile.ZipFile(output_fn, mode='w') as bundle:
+            for fn, normalized, score in zip(fns, records, scores):
+                normalized['credit_score'] = (
+                    int(score) if notna(score) else None
+                )
+                bundle.writestr(
+                    fn.rsplit('.', maxsplit=1)[0] + '.json',
+                    json.dumps(normalized, indent=4)
+                )
         files.download(output_fn)
-    button = widgets.Button(
-        description='Download validated data'
-    )
-    button.layout.width = 'auto'
-    button.on_click(on_button_click)
-    display(button)
\ No newline at end of file
+    if records:
+        button = widgets.Button(
+            description='Download validated data'
+        )
+        button.layout.width = 'auto'
+        button.on_click(on_button_click)
+        display(button)
@@ -1,15 +1,101 @@
 # Created 2023-10-21
 
 
-from .utils import notna
+from .utils import notna, content_hash
+from .gridcache import save_grid, load_grid, grid_path
 from contextlib import suppress
+import csv
+import io
+from itertools import islice
 import numpy as np
 import os
 import pandas as pd
 import re
 
 
+# Constants
+# Leading bytes of xlsx/xlsm (zip) and legacy xls (OLE2) workbooks
+WORKBOOK_SIGNATURES = (b'PK\x03\x04', b'\xd0\xcf\x11\xe0')
+DELIMITERS = (',', '\t', ';', '|')
+SNIFF_SIZE = 2**14
+TEXT_ENCODINGS = ('utf-8-sig', 'cp1252')
+SECTION_TAGS = (
+    ('personal_data', 'name'),
+    ('dependents', 'name of dependents|rela(?:sh|t)ionship'),
+    ('character_references', 'address|contact number'),
+    ('income_data', 'sources of income|adjudication'),
+    ('client_reputation', '(?:informant|contact).*remarks'),
+    ('other_creditors', 'creditor'),
+    ('client_assets', 'encumbr'),
+    ('credit_assessment', 'remarks'),
+)
+# The leading sections must all appear within the first rows of a report
+SCREEN_TAGS = SECTION_TAGS[:2]
+SCREEN_ROWS = 40
+SCREEN_SIZE = 2**16
+
+
+class NotCreditReportError(ValueError):
+    'Raised for files that fail the credit report pre-screen.'
+
+
 # Data loading and sectioning
+def read_file_bytes(file, size=-1) -> bytes:
+    'Read up to size bytes of a path, bytes or binary file object.'
+    if isinstance(file, (bytes, bytearray, memoryview)):
+        return bytes(file[:size] if size >= 0 else file)
+    elif hasattr(file, 'read'):
+        position = file.tell()
+        head = file.read(size)
+        file.seek(position)
+        return head
+    else:
+        with open(file, mode='rb') as f:
+            return f.read(size)
+
+def is_delimited_text(file) -> bool:
+    'Check if a file is delimited text rather than an Excel workbook.'
+    return not read_file_bytes(file, 8).startswith(WORKBOOK_SIGNATURES)
+
+def decode_text(raw) -> str:
+    'Decode exported text, falling back to Windows encoding.'
+    for encoding in TEXT_ENCODINGS[:-1]:
+        with suppress(UnicodeDecodeError):
+            return raw.decode(encoding)
+    return raw.decode(TEXT_ENCODINGS[-1], errors='replace')
+
+def read_delimited_sheet(file, nrows=None) -> pd.DataFrame:
+    'Read a CSV/TSV export of a credit sheet into a header-less string grid.'
+    # Leading rows only need the start of the file
+    size = -1 if nrows is None else SCREEN_SIZE
+    text = decode_text(read_file_bytes(file, size))
+    sample = text[:SNIFF_SIZE]
+    delimiter = max(DELIMITERS, key=sample.count)
+    # Rows are ragged, so size the grid by the widest row up front
+    n_cols = max(
+        map(len, islice(
+            csv.reader(io.StringIO(text), delimiter=delimiter), nrows
+        )),
+        default=1
+    )
+    report_sheet = pd.read_csv(
+        io.StringIO(text),
+        sep=delimiter,
+        header=None,
+        names=range(n_cols),
+        dtype=str,
+        engine='c',
+        skip_blank_lines=False,
+        nrows=nrows
+    )
+    return report_sheet
+
+def read_raw_sheet(file, nrows=None) -> pd.DataFrame:
+    'Read the first sheet (or its first nrows) of a workbook or text export.'
+    if is_delimited_text(file):
+        return read_delimited_sheet(file, nrows)
+    return pd.read_excel(file, header=None, dtype=str, nrows=nrows)
+
 def wipe_colon(df) -> pd.DataFrame:
     'Remove all colons from a DataFrame.'
     cleaned = (
@@ -22,26 +108,25 @@ def wipe_colon(df) -> pd.DataFrame:
     )
     return cleaned
 
-def load_report_sheet(file) -> pd.DataFrame:
-    'Load a raw credit report sheet.'
-    report_sheet = pd.read_excel(file, header=None, dtype=str)
+def load_report_sheet(file, cache_dir=None) -> pd.DataFrame:
+    'Load a raw credit report sheet, optionally through a grid cache.'
+    if cache_dir is not None:
+        cached_path = grid_path(cache_dir, content_hash(file))
+        if os.path.exists(cached_path):
+            return load_grid(cached_path)
+    report_sheet = read_raw_sheet(file)
     if not report_sheet[0].any():
         report_sheet = report_sheet.drop(columns=0)
         report_sheet.columns = range(len(report_sheet.columns))
-    return wipe_colon(report_sheet)
+    report_sheet = wipe_colon(report_sheet)
+    if cache_dir is not None:
+        os.makedirs(os.path.dirname(cached_path), exist_ok=True)
+        save_grid(report_sheet, cached_path)
+    return report_sheet
     
-def locate_sections(report_sheet) -> dict:
+def locate_sections(report_sheet, section_tags=SECTION_TAGS) -> dict:
     'Locate section bounds.'
-    section_tags = iter((
-        ('personal_data', 'name'),
-        ('dependents', 'name of dependents|rela(?:sh|t)ionship'),
-        ('character_references', 'address|contact number'),
-        ('income_data', 'sources of income|adjudication'),
-        ('client_reputation', '(?:informant|contact).*remarks'),
-        ('other_creditors', 'creditor'),
-        ('client_assets', 'encumbr'),
-        ('credit_assessment', 'remarks'),
-    ))
+    section_tags = iter(section_tags)
     section, tag = next(section_tags)
     tag_locations = []
     corpus = (
@@ -61,6 +146,32 @@ def locate_sections(report_sheet) -> dict:
         in zip(sections, locations, locations[1:])
     }
     return section_bounds
+
+def is_credit_sheet(head) -> bool:
+    'Check if the leading rows of a sheet contain the leading section tags.'
+    if head.empty:
+        return False
+    section_bounds = locate_sections(head, SCREEN_TAGS)
+    return all(section in section_bounds for section, _ in SCREEN_TAGS)
+
+def is_credit_report(file, nrows=SCREEN_ROWS, cache_dir=None) -> bool:
+    '''Cheaply check if a file looks like a credit report.
+
+    Only the first nrows of the first sheet are read, and they must
+    contain the leading section tags in order. With a cache_dir, a
+    cached grid of the file is screened instead of the file itself.
+    '''
+    if cache_dir is not None:
+        cached_path = grid_path(cache_dir, content_hash(file))
+        if os.path.exists(cached_path):
+            return is_credit_sheet(load_grid(cached_path).head(nrows))
+    position = file.tell() if hasattr(file, 'read') else None
+    try:
+        head = read_raw_sheet(file, nrows)
+    finally:
+        if position is not None:
+            file.seek(position)
+    return is_credit_sheet(head)
     
 
 # Parser utils
@@ -266,9 +377,9 @@ def get_file_details(fn):
     
     
 # Report parser
-def parse_credit_report(file, **kwargs):
-    'Parse a single credit file.'
-    report_sheet = load_report_sheet(file)
+def parse_credit_report(file, cache_dir=None, **kwargs):
+    'Parse a single credit file; cache_dir caches the decoded sheet grid.'
+    report_sheet = load_report_sheet(file, cache_dir)
     section_bounds = locate_sections(report_sheet)
     parsed = {**kwargs}
     if isinstance(file, str):
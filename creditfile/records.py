@@ -0,0 +1,177 @@
+# Created 2026-10-19
+
+
+from .normalize import (
+    PERSONAL_DATA_FIELDS,
+    INCOME_SOURCE_CORRECTIONS,
+    INCOME_FIELDS,
+    INCOME_CORRECTIONS,
+    EXPENSE_FIELDS,
+    EXPENSE_CORRECTIONS,
+    SUMMARY_CORRECTIONS,
+    OFFICER_ASSESSMENT_FIELDS
+)
+
+import pandas as pd
+import sys
+
+
+# Record base
+# Records built from the same keys share one frozenset of given fields
+_GIVEN_FIELDS = {}
+
+class Record:
+    '''Slotted record with a fixed set of fields; unset fields are None.
+
+    The fields given at construction are remembered, so explicit None
+    values and empty nested records survive a to_dict round trip.
+    '''
+    __slots__ = ('_given',)
+    _fields = ()
+    _nested = {}
+    _required = ()
+
+    def __init__(self, **kwargs):
+        for k in self._fields:
+            setattr(self, k, None)
+        for k, v in kwargs.items():
+            if k not in self._fields:
+                raise ValueError(f'Unknown {type(self).__name__} field: {k}')
+            setattr(self, k, v)
+        given = frozenset(kwargs)
+        self._given = _GIVEN_FIELDS.setdefault(given, given)
+
+    def __repr__(self):
+        fields = ', '.join(
+            f'{k}={getattr(self, k)!r}' for k in self._fields
+            if getattr(self, k) is not None
+        )
+        return f'{type(self).__name__}({fields})'
+
+    def __eq__(self, other):
+        return type(self) is type(other) and all(
+            getattr(self, k) == getattr(other, k) for k in self._fields
+        )
+
+    @classmethod
+    def from_dict(cls, data):
+        'Build a record from its normalized dict form.'
+        kwargs = {
+            k: cls._nested[k].from_dict(v)
+            if k in cls._nested and v is not None else v
+            for k, v in data.items()
+        }
+        return cls(**kwargs)
+
+    def to_dict(self) -> dict:
+        'Convert back to the normalized dict form.'
+        data = {}
+        for k in self._fields:
+            v = getattr(self, k)
+            if v is not None:
+                data[k] = v.to_dict() if k in self._nested else v
+            elif k in self._given or k in self._required:
+                data[k] = None
+        return data
+
+def make_record_type(name, fields, nested=None, required=()):
+    'Create a slotted Record subclass with the given fields.'
+    nested = nested or {}
+    fields = (*required, *nested, *sorted(set(fields) - set(nested) - set(required)))
+    namespace = {
+        '__slots__': fields,
+        '_fields': fields,
+        '_nested': nested,
+        '_required': tuple(required)
+    }
+    return type(name, (Record,), namespace)
+
+
+# Record types
+PersonalData = make_record_type(
+    'PersonalData', PERSONAL_DATA_FIELDS | {'dependent_ages'}
+)
+IncomeSourceDetails = make_record_type(
+    'IncomeSourceDetails', set(INCOME_SOURCE_CORRECTIONS.values())
+)
+IncomeItems = make_record_type(
+    'IncomeItems', INCOME_FIELDS | set(INCOME_CORRECTIONS.values())
+)
+ExpenseItems = make_record_type(
+    'ExpenseItems', EXPENSE_FIELDS | set(EXPENSE_CORRECTIONS.values())
+)
+IncomeSummary = make_record_type(
+    'IncomeSummary', set(SUMMARY_CORRECTIONS.values())
+)
+IncomeAnalysis = make_record_type(
+    'IncomeAnalysis', (),
+    nested={
+        'income': IncomeItems,
+        'expense': ExpenseItems,
+        'summary': IncomeSummary
+    }
+)
+OfficerAssessment = make_record_type(
+    'OfficerAssessment', OFFICER_ASSESSMENT_FIELDS
+)
+CreditRecord = make_record_type(
+    'CreditRecord', {'credit_score'},
+    nested={
+        'personal_data': PersonalData,
+        'income_source_details': IncomeSourceDetails,
+        'income_analysis': IncomeAnalysis,
+        'officer_assessment': OfficerAssessment
+    },
+    required=('filename', 'last_modified')
+)
+
+
+# Batch views
+def flatten_record(record, prefix='') -> dict:
+    'Flatten a record into {"section__field": value} pairs.'
+    flattened = {}
+    for k in record._fields:
+        v = getattr(record, k)
+        if k in record._nested:
+            if v is not None:
+                flattened.update(flatten_record(v, f'{prefix}{k}__'))
+        elif v is not None:
+            flattened[f'{prefix}{k}'] = v
+    return flattened
+
+def record_columns(record_type, prefix='') -> list:
+    'List the flattened column names of a record type.'
+    columns = []
+    for k in record_type._fields:
+        if k in record_type._nested:
+            columns += record_columns(record_type._nested[k], f'{prefix}{k}__')
+        else:
+            columns.append(f'{prefix}{k}')
+    return columns
+
+def records_to_frame(records, record_type=CreditRecord) -> pd.DataFrame:
+    'Columnar view of a batch of records.'
+    return pd.DataFrame.from_records(
+        (flatten_record(record) for record in records),
+        columns=record_columns(record_type)
+    )
+
+
+# Memory accounting
+def deep_sizeof(obj, seen=None) -> int:
+    'Approximate memory footprint of an object graph in bytes.'
+    if seen is None:
+        seen = set()
+    if id(obj) in seen:
+        return 0
+    seen.add(id(obj))
+    size = sys.getsizeof(obj)
+    if isinstance(obj, dict):
+        size += sum(
+            deep_sizeof(k, seen) + deep_sizeof(v, seen) for k, v in obj.items()
+        )
+    elif isinstance(obj, (list, tuple, set)):
+        size += sum(deep_sizeof(x, seen) for x in obj)
+    elif isinstance(obj, Record):
+        size += sum(deep_sizeof(getattr(obj, k), seen) for k in obj._fields)
+    return size
@@ -1,28 +1,136 @@
 # Created 2023-10-23
 
 
-from importlib_resources import files, as_file
+from .artifacts import get_artifacts
+from .featurize import (
+    MODEL_FEATURES,
+    prepare_feature_matrix,
+    feature_columns
+)
+from .validate import scorable_mask
+
+from collections import namedtuple
 import joblib
 import lightgbm as lgb
+import numpy as np
+import pandas as pd
+
+
+# Constants
+ACCEPTABLE_SCORE = 50
+CHAMPION = 'champion'
+ScoringModel = namedtuple('ScoringModel', ['classifier', 'scaler', 'columns'])
 
 
 # Artifacts
-RESOURCE_LOC = files(__package__)
-with as_file(RESOURCE_LOC.joinpath('artifacts/model.txt')) as eml:
-    classifier = lgb.Booster(model_file=eml)
-with as_file(RESOURCE_LOC.joinpath('artifacts/score-scaler.pickle')) as eml:
-    scaler = joblib.load(eml)
+def __getattr__(name):
+    # Keeps score.classifier and score.scaler pointing at the current set
+    if name in ('classifier', 'scaler'):
+        return getattr(get_artifacts(), name)
+    raise AttributeError(f'module {__name__!r} has no attribute {name!r}')
 
 
 # Scorers
 def predict_delinquency(features):
     'Calculate a delinquency score based on features.'
-    return classifier.predict([features], raw_score=True)
+    return get_artifacts().classifier.predict([features], raw_score=True)
     
 
 def make_credit_score(features):
     'Calculate a credit score from 1-100.'
     delinquency_score = predict_delinquency(features)
-    delinquency_score = scaler.transform([delinquency_score])[0, 0]
+    delinquency_score = (
+        get_artifacts().scaler.transform([delinquency_score])[0, 0]
+    )
     credit_score = round((1-delinquency_score)*100)
-    return credit_score
\ No newline at end of file
+    return credit_score
+
+
+def make_credit_scores(feature_matrix, mask=None, classifier=None,
+                       scaler=None):
+    'Calculate credit scores for a feature matrix; masked rows are NaN.'
+    feature_matrix = np.asarray(feature_matrix, dtype=float)
+    if mask is None:
+        mask = np.ones(len(feature_matrix), dtype=bool)
+    credit_scores = np.full(len(feature_matrix), np.nan)
+    if mask.any():
+        artifacts = get_artifacts()
+        if classifier is None:
+            classifier = artifacts.classifier
+        if scaler is None:
+            scaler = artifacts.scaler
+        delinquency_scores = classifier.predict(
+            feature_matrix[mask], raw_score=True
+        )
+        delinquency_scores = (
+            scaler.transform(delinquency_scores[:, None])[:, 0]
+        )
+        credit_scores[mask] = np.round((1-delinquency_scores)*100)
+    return credit_scores
+
+
+def score_normalized(records, feature_matrix=None):
+    '''Score normalized records, computing only the features the model uses.
+
+    The too-many-missing gate counts only those features. A precomputed
+    feature matrix can be passed instead.
+    '''
+    used_features = get_artifacts().used_features
+    if feature_matrix is None:
+        feature_matrix = prepare_feature_matrix(records, used_features)
+    mask = scorable_mask(feature_matrix, columns=feature_columns(used_features))
+    return make_credit_scores(feature_matrix, mask)
+
+
+# Champion/challenger scoring
+MODEL_REGISTRY = {}
+
+def register_model(name, model_file, scaler_file, features=None):
+    '''Register a challenger model/scaler pair.
+
+    Its features default to the model's own feature names and must be a
+    subset of MODEL_FEATURES, so one shared feature matrix serves every
+    registered model.
+    '''
+    if name == CHAMPION:
+        raise ValueError(f'{CHAMPION!r} is reserved for the loaded artifacts.')
+    classifier = lgb.Booster(model_file=model_file)
+    scaler = joblib.load(scaler_file)
+    features = tuple(features or classifier.feature_name())
+    unknown = set(features) - set(MODEL_FEATURES)
+    if unknown:
+        raise ValueError(f'Features not in MODEL_FEATURES: {sorted(unknown)}')
+    columns = np.array([MODEL_FEATURES.index(k) for k in features])
+    MODEL_REGISTRY[name] = ScoringModel(classifier, scaler, columns)
+
+def unregister_model(name):
+    'Remove a challenger model.'
+    del MODEL_REGISTRY[name]
+
+def score_models(feature_matrix, mask=None, min_score=ACCEPTABLE_SCORE) -> dict:
+    '''Score a shared feature matrix with the champion and every challenger.
+
+    Returns per-model scores and each challenger's agreement with the
+    champion: mean absolute score difference, correlation, and the share
+    of rows with the same accept/reject decision at min_score.
+    '''
+    feature_matrix = np.asarray(feature_matrix, dtype=float)
+    scores = pd.DataFrame({CHAMPION: make_credit_scores(feature_matrix, mask)})
+    for name, model in MODEL_REGISTRY.items():
+        scores[name] = make_credit_scores(
+            feature_matrix[:, model.columns], mask,
+            model.classifier, model.scaler
+        )
+    champion = scores[CHAMPION]
+    agreement = pd.DataFrame(
+        {
+            'mean_abs_diff': (scores[name] - champion).abs().mean(),
+            'correlation': scores[name].corr(champion),
+            'decision_agreement': (
+                (scores[name] >= min_score) == (champion >= min_score)
+            )[champion.notna()].mean()
+        }
+        for name in scores.columns.drop(CHAMPION)
+    )
+    agreement.index = scores.columns.drop(CHAMPION)
+    return {'scores': scores, 'agreement': agreement}
@@ -0,0 +1,109 @@
+# Created 2026-10-19
+
+
+from .utils import content_hash
+from .batch import run_batch
+
+from contextlib import suppress
+import glob
+import json
+import os
+
+
+# Constants
+MANIFEST_FILE = 'manifest.jsonl'
+JOURNAL_PATTERN = 'shard-{:04d}.jsonl'
+
+
+# Manifest
+def assign_shard(digest, n_shards) -> int:
+    'Deterministic shard of a content hash.'
+    return int(digest[:16], 16) % n_shards
+
+def make_manifest(files, out_dir, n_shards) -> str:
+    'Write a manifest assigning each file to a shard by content hash.'
+    os.makedirs(out_dir, exist_ok=True)
+    manifest_path = os.path.join(out_dir, MANIFEST_FILE)
+    with open(manifest_path, mode='w') as manifest:
+        for file in files:
+            digest = content_hash(file)
+            manifest.write(json.dumps({
+                'file': os.path.abspath(file),
+                'hash': digest,
+                'shard': assign_shard(digest, n_shards),
+                'n_shards': n_shards
+            }) + '\n')
+    return manifest_path
+
+def read_jsonl(path) -> list:
+    'Read JSON lines, skipping a torn final line left by a crash.'
+    entries = []
+    with suppress(FileNotFoundError), open(path) as file:
+        for line in file:
+            with suppress(json.JSONDecodeError):
+                entries.append(json.loads(line))
+    return entries
+
+
+# Shard runs
+def run_shard(out_dir, shard, retry_failures=False, **batch_options) -> int:
+    '''Process one shard of a manifest, resuming from its journal.
+
+    Each finished file is appended to the shard's journal and synced to
+    disk, so a rerun skips files already done. With retry_failures,
+    failed files are run again, except quarantined ones that have not
+    been moved back to their manifest path; those keep their original
+    failure. Run at most one process per shard. Returns the number of
+    files processed in this run.
+    '''
+    manifest = [
+        entry for entry in read_jsonl(os.path.join(out_dir, MANIFEST_FILE))
+        if entry['shard'] == shard
+    ]
+    journal_path = os.path.join(out_dir, JOURNAL_PATTERN.format(shard))
+    # Later entries (e.g. retried failures) supersede earlier ones
+    latest = {entry['hash']: entry for entry in read_jsonl(journal_path)}
+    completed = {
+        digest for digest, entry in latest.items()
+        if not retry_failures
+        or entry['failure'] is None
+        or (
+            'quarantined' in entry['failure']
+            and not os.path.exists(entry['file'])
+        )
+    }
+    todo = [entry for entry in manifest if entry['hash'] not in completed]
+    files = [entry['file'] for entry in todo]
+    with open(journal_path, mode='a+') as journal:
+        # Terminate a torn final line so new entries start cleanly
+        if journal.tell():
+            journal.seek(journal.tell() - 1)
+            if journal.read(1) != '\n':
+                journal.write('\n')
+        for result in run_batch(files, **batch_options):
+            journal.write(json.dumps({
+                'hash': todo[result.index]['hash'],
+                'file': todo[result.index]['file'],
+                'record': result.record,
+                'failure': result.failure
+            }) + '\n')
+            journal.flush()
+            os.fsync(journal.fileno())
+    return len(todo)
+
+def merge_shards(out_dir, output_path=None) -> list:
+    'Combine shard journals into one result set, one entry per file.'
+    merged = {}
+    journal_paths = sorted(
+        glob.glob(os.path.join(out_dir, JOURNAL_PATTERN.replace('{:04d}', '*')))
+    )
+    for journal_path in journal_paths:
+        for entry in read_jsonl(journal_path):
+            # Later entries (e.g. retried failures) supersede earlier ones
+            merged[entry['hash']] = entry
+    results = list(merged.values())
+    if output_path is not None:
+        with open(output_path, mode='w') as output:
+            for entry in results:
+                output.write(json.dumps(entry) + '\n')
+    return results
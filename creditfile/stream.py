@@ -0,0 +1,137 @@
+# Created 2026-10-19
+
+
+from .parse import parse_credit_report, is_credit_report, NotCreditReportError
+from .normalize import normalize_credit_data
+from .featurize import prepare_feature_matrix
+from .score import score_normalized
+
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+from itertools import islice
+import os
+
+
+# Constants
+STAGES = ('parsed', 'normalized', 'features', 'score')
+REPORT_EXTENSIONS = ('.xlsx', '.xlsm', '.xls', '.csv', '.tsv')
+CHUNK_SIZE = 32
+PREFETCH = 4
+
+
+# Inputs
+def list_report_files(paths_or_dir) -> list:
+    'Expand a directory (non-recursively) or pass through a list of paths.'
+    if isinstance(paths_or_dir, (str, os.PathLike)):
+        if not os.path.isdir(paths_or_dir):
+            return [os.fspath(paths_or_dir)]
+        return sorted(
+            entry.path for entry in os.scandir(paths_or_dir)
+            if entry.is_file()
+            and entry.name.lower().endswith(REPORT_EXTENSIONS)
+            and not entry.name.startswith('~$')
+        )
+    return [os.fspath(path) for path in paths_or_dir]
+
+
+# Stages
+def load_record(file, last_stage, cache_dir=None, screen=True) -> dict:
+    'Run the per-file stages (parse, normalize) for one file.'
+    if screen and not is_credit_report(file, cache_dir=cache_dir):
+        raise NotCreditReportError(f'Not a credit report: {file}')
+    record = {'file': file, 'parsed': parse_credit_report(file, cache_dir)}
+    if STAGES.index(last_stage) >= STAGES.index('normalized'):
+        record['normalized'] = normalize_credit_data(record['parsed'])
+    return record
+
+def prefetch_records(files, last_stage, cache_dir=None, prefetch=PREFETCH,
+                     executor=None, on_error='raise', screen=True,
+                     counts=None):
+    '''Yield loaded records in order, keeping at most prefetch files in flight.
+
+    Files rejected by the pre-screen are skipped. Outcomes (ok, rejected,
+    error) are tallied into counts if given.
+    '''
+    if counts is None:
+        counts = {}
+    own_executor = executor is None
+    if own_executor:
+        executor = ThreadPoolExecutor(max_workers=1)
+    files = iter(files)
+    in_flight = deque()
+
+    def submit(file):
+        in_flight.append(
+            executor.submit(load_record, file, last_stage, cache_dir, screen)
+        )
+
+    try:
+        for file in islice(files, prefetch):
+            submit(file)
+        while in_flight:
+            future = in_flight.popleft()
+            for file in islice(files, 1):
+                submit(file)
+            try:
+                record = future.result()
+            except NotCreditReportError:
+                counts['rejected'] = counts.get('rejected', 0) + 1
+                continue
+            except Exception:
+                counts['error'] = counts.get('error', 0) + 1
+                if on_error == 'raise':
+                    raise
+                continue
+            counts['ok'] = counts.get('ok', 0) + 1
+            yield record
+    finally:
+        for future in in_flight:
+            future.cancel()
+        if own_executor:
+            executor.shutdown(wait=False)
+
+def iter_credit_reports(paths_or_dir, stages=STAGES, chunk_size=CHUNK_SIZE,
+                        prefetch=PREFETCH, cache_dir=None, executor=None,
+                        on_error='raise', screen=True, counts=None):
+    '''Lazily yield credit report records through the pipeline.
+
+    The pipeline runs up to the last of the requested stages (parsed,
+    normalized, features, score). Each yielded dict has the file path
+    plus the requested stage outputs. Files are loaded ahead in the
+    background, optionally on a given executor, and featurized and
+    scored in chunks, so memory stays bounded by prefetch + chunk_size
+    records. Failing files raise, or are skipped with on_error='skip'.
+    Files that fail the credit report pre-screen are skipped, and each
+    outcome (ok, rejected, error) is tallied into counts if given.
+    '''
+    if isinstance(stages, str):
+        stages = (stages,)
+    unknown = set(stages) - set(STAGES)
+    if unknown:
+        raise ValueError(f'Unknown stages: {sorted(unknown)}')
+    last_stage = max(stages, key=STAGES.index)
+    records = prefetch_records(
+        list_report_files(paths_or_dir), last_stage, cache_dir, prefetch,
+        executor, on_error, screen, counts
+    )
+    batched = STAGES.index(last_stage) >= STAGES.index('features')
+    while True:
+        chunk = list(islice(records, chunk_size if batched else 1))
+        if not chunk:
+            break
+        if batched:
+            normalized = [record['normalized'] for record in chunk]
+            feature_matrix = None
+            if 'features' in stages:
+                feature_matrix = prepare_feature_matrix(normalized)
+                for record, features in zip(chunk, feature_matrix):
+                    record['features'] = features
+            if last_stage == 'score':
+                credit_scores = score_normalized(normalized, feature_matrix)
+                for record, credit_score in zip(chunk, credit_scores):
+                    record['score'] = credit_score
+        for record in chunk:
+            yield {
+                k: v for k, v in record.items()
+                if k == 'file' or k in stages
+            }
@@ -0,0 +1,162 @@
+# Created 2026-10-19
+
+
+from .artifacts import get_artifacts
+from .featurize import MODEL_FEATURES, AMORTIZATION_INTEREST, feature_columns
+from .loancalc import Loan
+from .validate import scorable_mask
+from .score import ACCEPTABLE_SCORE, make_credit_scores
+
+from collections import namedtuple
+import numpy as np
+import pandas as pd
+
+
+# Constants
+FEATURE_INDEX = {name: i for i, name in enumerate(MODEL_FEATURES)}
+INCOME_FEATURES = (
+    'num__gross_income',
+    'num__employment_income',
+    'num__business_income',
+    'num__spouse_income'
+)
+BASELINE = 'baseline'
+# Inner edges of the score bands; scores below the first edge form band 0
+SCORE_BANDS = (20, 40, ACCEPTABLE_SCORE, 60, 80)
+UNSCORED = 'unscored'
+Scenario = namedtuple('Scenario', ['name', 'rate_shift', 'income_factor'])
+
+
+# Scenarios
+def make_scenarios(rate_shifts, income_factors) -> list:
+    'Cross rate shifts (added to the monthly rate) with income factors.'
+    return [
+        Scenario(f'rate{rate_shift:+g}_income x{income_factor:g}',
+                 rate_shift, income_factor)
+        for rate_shift in rate_shifts
+        for income_factor in income_factors
+    ]
+
+def band_labels(bands=SCORE_BANDS) -> list:
+    'Labels of the score bands, with a final band for unscored rows.'
+    edges = (None, *bands, None)
+    labels = [
+        f'<{upper}' if lower is None
+        else f'>={lower}' if upper is None
+        else f'{lower}-{upper - 1}'
+        for lower, upper in zip(edges, edges[1:])
+    ]
+    return labels + [UNSCORED]
+
+def score_bands(scores, bands=SCORE_BANDS) -> np.ndarray:
+    'Band index of each score; NaN (gated) scores get the last band.'
+    band_index = np.digitize(scores, bands)
+    band_index[np.isnan(scores)] = len(bands) + 1
+    return band_index
+
+
+# Stress testing
+def apply_scenario(feature_matrix, scenario, interest=AMORTIZATION_INTEREST,
+                   out=None) -> np.ndarray:
+    '''Shock the loan amortization and income features of a feature matrix.
+
+    Amortization is rescaled by how much the shifted rate raises the
+    payment for each loan term, so the amortization on file is kept when
+    there is no rate shift. Rows without a loan term keep theirs. Income
+    features are multiplied by the income factor and the amortization to
+    income ratio is recomputed.
+    '''
+    shocked_interest = interest + scenario.rate_shift
+    if shocked_interest <= 0:
+        raise ValueError(f'Shocked interest must be positive: {scenario}')
+    if out is None:
+        out = np.array(feature_matrix, dtype=float)
+    else:
+        np.copyto(out, feature_matrix)
+    loan_term = out[:, FEATURE_INDEX['num__loan_term']]
+    with np.errstate(divide='ignore', invalid='ignore'):
+        payment_factor = (
+            Loan.amort_calculator(1, shocked_interest, loan_term)
+            / Loan.amort_calculator(1, interest, loan_term)
+        )
+    payment_factor[~np.isfinite(payment_factor)] = 1
+    out[:, FEATURE_INDEX['num__monthly_amortization']] *= payment_factor
+    for name in INCOME_FEATURES:
+        out[:, FEATURE_INDEX[name]] *= scenario.income_factor
+    with np.errstate(divide='ignore', invalid='ignore'):
+        out[:, FEATURE_INDEX['num__amort_income_ratio']] = (
+            out[:, FEATURE_INDEX['num__monthly_amortization']]
+            / out[:, FEATURE_INDEX['num__gross_income']]
+        )
+    return out
+
+def migration_matrix(baseline_bands, scenario_bands,
+                     labels=None) -> pd.DataFrame:
+    'Counts of rows moving from each baseline band (rows) to each band.'
+    if labels is None:
+        labels = band_labels()
+    n_bands = len(labels)
+    counts = np.bincount(
+        baseline_bands * n_bands + scenario_bands, minlength=n_bands**2
+    )
+    migrations = pd.DataFrame(
+        counts.reshape(n_bands, n_bands), index=labels, columns=labels
+    )
+    migrations.index.name = BASELINE
+    return migrations
+
+def stress_test(feature_matrix, scenarios, interest=AMORTIZATION_INTEREST,
+                bands=SCORE_BANDS, min_score=ACCEPTABLE_SCORE) -> dict:
+    '''Re-score a portfolio under interest-rate and income shocks.
+
+    The feature matrix holds one scored applicant per row, as from
+    prepare_feature_matrix. Each scenario is applied to the whole
+    portfolio and scored in one batch; rows gated out for missing
+    features stay unscored. Returns the scores per scenario, a score
+    band migration matrix from the baseline for each scenario, and a
+    per-scenario summary of mean score, acceptance rate at min_score
+    and the shares of scored rows moving down or up a band.
+    '''
+    feature_matrix = np.asarray(feature_matrix, dtype=float)
+    mask = scorable_mask(
+        feature_matrix,
+        columns=feature_columns(get_artifacts().used_features)
+    )
+    labels = band_labels(bands)
+    scores = {BASELINE: make_credit_scores(feature_matrix, mask)}
+    baseline_bands = score_bands(scores[BASELINE], bands)
+    scored = mask.any()
+    migrations, summary = {}, []
+    shocked = np.empty_like(feature_matrix)
+    for scenario in scenarios:
+        apply_scenario(feature_matrix, scenario, interest, out=shocked)
+        scenario_scores = make_credit_scores(shocked, mask)
+        scenario_bands = score_bands(scenario_scores, bands)
+        scores[scenario.name] = scenario_scores
+        migrations[scenario.name] = migration_matrix(
+            baseline_bands, scenario_bands, labels
+        )
+        summary.append({
+            'scenario': scenario.name,
+            'rate_shift': scenario.rate_shift,
+            'income_factor': scenario.income_factor,
+            'mean_score': np.nanmean(scenario_scores) if scored else np.nan,
+            'acceptance_rate': (
+                (scenario_scores[mask] >= min_score).mean()
+                if scored else np.nan
+            ),
+            'downgraded': (
+                (scenario_bands < baseline_bands)[mask].mean()
+                if scored else np.nan
+            ),
+            'upgraded': (
+                (scenario_bands > baseline_bands)[mask].mean()
+                if scored else np.nan
+            )
+        })
+    results = {
+        'scores': pd.DataFrame(scores),
+        'migrations': migrations,
+        'summary': pd.DataFrame(summary).set_index('scenario')
+    }
+    return results
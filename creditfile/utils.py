@@ -1,32 +1,51 @@
 # Created 2023-10-11
 
 
+from functools import lru_cache
+import hashlib
 import re
 import unicodedata
 from numbers import Number
 
+import numpy as np
+import pandas as pd
+
+
+# Constants
+CACHE_SIZE = 2**16
+HASH_CHUNK_SIZE = 2**20
+NON_NUMERIC_PATTERN = re.compile(r'[^0-9.\-]')
+SEPARATOR_PATTERN = re.compile(r'[\.\,\-\/\(\)\s]+')
+NON_ALPHANUMERIC_PATTERN = re.compile(r'[^a-z0-9 ]')
+
 
 def notna(x):
     'Checks if value is observed.'
     return x == x and x is not None
-    
+
 def isna(x):
     'Complement to notna.'
     return not notna(x)
-    
+
+@lru_cache(maxsize=CACHE_SIZE)
+def _parse_numeric(num):
+    'Parse a numeric string, returning None on failure.'
+    try:
+        return float(NON_NUMERIC_PATTERN.sub('', num))
+    except ValueError:
+        return None
+
 def force_numeric(num, error_value=float('nan')):
     'Force an object to a numerical type.'
     if isinstance(num, Number) and notna(num):
         return num
     elif isinstance(num, str):
-        num = re.sub(r'[^0-9.\-]', '', num)
-        try:
-            return float(num)
-        except ValueError:
-            return error_value
+        num = _parse_numeric(num)
+        return error_value if num is None else num
     else:
         return error_value
-        
+
+@lru_cache(maxsize=CACHE_SIZE)
 def normalize_text(text):
     'Normalize text to ascii.'
     normalized = (
@@ -35,6 +54,88 @@ def normalize_text(text):
         .decode('utf-8')
         .lower()
     )
-    normalized = re.sub(r'[\.\,\-\/\(\)\s]+', ' ', normalized).strip()
-    normalized = re.sub(r'[^a-z0-9 ]', '', normalized)
-    return normalized
\ No newline at end of file
+    normalized = SEPARATOR_PATTERN.sub(' ', normalized).strip()
+    normalized = NON_ALPHANUMERIC_PATTERN.sub('', normalized)
+    return normalized
+
+
+# Array counterparts
+def _as_object_series(values) -> pd.Series:
+    'Wrap values in a 1-d object Series, keeping list items intact.'
+    if isinstance(values, pd.Series):
+        return values.astype(object).reset_index(drop=True)
+    return pd.Series(list(values), dtype=object)
+
+def notna_mask(values) -> np.ndarray:
+    'Elementwise notna.'
+    if isinstance(values, np.ndarray) and values.dtype.kind in 'fc':
+        return ~np.isnan(values)
+    values = _as_object_series(values).to_numpy()
+    return (values == values) & np.not_equal(values, None)
+
+def isna_mask(values) -> np.ndarray:
+    'Elementwise isna.'
+    return ~notna_mask(values)
+
+def force_numeric_array(values, error_value=float('nan')) -> np.ndarray:
+    'Elementwise force_numeric; float array unless error_value is not numeric.'
+    dtype = float if isinstance(error_value, Number) else object
+    if isinstance(values, np.ndarray) and values.dtype.kind in 'biuf':
+        forced = values.astype(dtype)
+        forced[isna_mask(forced)] = error_value
+        return forced
+    values = _as_object_series(values)
+    forced = np.full(len(values), error_value, dtype=dtype)
+    is_number = (
+        values.map(lambda x: isinstance(x, Number)).to_numpy(bool)
+        & notna_mask(values)
+    )
+    forced[is_number] = values[is_number].to_numpy()
+    is_str = values.map(lambda x: isinstance(x, str)).to_numpy(bool)
+    if is_str.any():
+        codes, uniques = pd.factorize(values[is_str])
+        parsed = np.array(
+            [_parse_numeric(num) for num in uniques], dtype=object
+        )
+        parsed[np.equal(parsed, None)] = error_value
+        forced[is_str] = parsed[codes]
+    return forced
+
+def normalize_text_array(values) -> np.ndarray:
+    'Elementwise normalize_text; non-string items become NaN.'
+    values = _as_object_series(values)
+    normalized = np.full(len(values), np.nan, dtype=object)
+    is_str = values.map(lambda x: isinstance(x, str)).to_numpy(bool)
+    if is_str.any():
+        codes, uniques = pd.factorize(values[is_str])
+        uniques = (
+            pd.Series(uniques, dtype=object).str
+            .normalize('NFKD').str
+            .encode('ascii', errors='ignore').str
+            .decode('utf-8').str
+            .lower().str
+            .replace(SEPARATOR_PATTERN, ' ', regex=True).str
+            .strip().str
+            .replace(NON_ALPHANUMERIC_PATTERN, '', regex=True)
+        )
+        normalized[is_str] = uniques.to_numpy()[codes]
+    return normalized
+
+
+
+# File utils
+def content_hash(file) -> str:
+    'SHA-256 hex digest of a file path, bytes or binary file object.'
+    digest = hashlib.sha256()
+    if isinstance(file, (bytes, bytearray, memoryview)):
+        digest.update(file)
+    elif hasattr(file, 'read'):
+        position = file.tell()
+        for chunk in iter(lambda: file.read(HASH_CHUNK_SIZE), b''):
+            digest.update(chunk)
+        file.seek(position)
+    else:
+        with open(file, mode='rb') as f:
+            for chunk in iter(lambda: f.read(HASH_CHUNK_SIZE), b''):
+                digest.update(chunk)
+    return digest.hexdigest()
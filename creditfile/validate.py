@@ -0,0 +1,137 @@
+# Created 2026-10-19
+
+
+from .utils import isna
+
+from collections.abc import Iterable
+import numpy as np
+import pandas as pd
+
+
+# Constants
+ESSENTIAL_FIELDS = {
+    'personal_data': [
+        'name',
+        'present_address',
+        'present_address_tenure',
+        'contact_no',
+        'birthplace',
+        'education',
+        'parents_name',
+        'parents_address',
+        'date_applied',
+        'unit_applied',
+        'loan_amount',
+        'loan_terms',
+        'housing_status',
+        'dob',
+        'age',
+        'marital_status',
+        'n_children',
+        'n_dependents',
+        'dependent_ages'
+    ],
+    'income_analysis': {
+        'summary': ['gross_income', 'monthly_amortization']
+    },
+    'officer_assessment': [
+        'loan_purpose',
+        'unit_payor',
+        'unit_rider',
+        'rider_license',
+        'cell_signal_status',
+        'prepared_by',
+        'remarks'
+    ]
+}
+MAX_MISSING_FEATURES = 5
+
+
+# Single record validation
+def is_missing(x):
+    return isna(x) or (isinstance(x, Iterable) and all(isna(_) for _ in x))
+
+def is_missing_field(value):
+    'Check if a field value is missing; lists are missing if all items are.'
+    return isna(value) or (isinstance(value, list) and is_missing(value))
+
+def validate_fields(data, essential_fields=ESSENTIAL_FIELDS):
+    'Check if the data contains all essential fields.'
+    missing_fields = {}
+    for k, v in essential_fields.items():
+        subset = data.get(k, None)
+        if isna(subset):
+            missing_fields[k] = v
+            continue
+        elif isinstance(v, dict):
+            missing = validate_fields(subset, v)
+        elif isinstance(v, list):
+            missing = [
+                field for field in v
+                if is_missing_field(subset.get(field, None))
+            ]
+        if missing:
+            missing_fields[k] = missing
+    return missing_fields
+
+
+# Batch validation
+def compile_fields(essential_fields=ESSENTIAL_FIELDS, prefix=()) -> tuple:
+    'Flatten nested essential fields into a tuple of key paths.'
+    paths = []
+    for k, v in essential_fields.items():
+        if isinstance(v, dict):
+            paths.extend(compile_fields(v, (*prefix, k)))
+        else:
+            paths.extend((*prefix, k, field) for field in v)
+    return tuple(paths)
+
+ESSENTIAL_PATHS = compile_fields()
+
+def missing_matrix(records, paths=ESSENTIAL_PATHS) -> pd.DataFrame:
+    'Boolean (n_files x n_fields) missingness matrix for a batch.'
+    columns = ['__'.join(path) for path in paths]
+    branches = {path[0] for path in paths}
+    frame = (
+        pd.json_normalize(
+            [{k: record.get(k) for k in branches} for record in records],
+            sep='__'
+        )
+        .reindex(columns=columns)
+    )
+    matrix = frame.isna().to_numpy()
+    # List values such as dependent ages are missing if all items are
+    for j, column in enumerate(columns):
+        values = frame[column]
+        if values.dtype == object:
+            is_list = values.map(lambda x: isinstance(x, list)).to_numpy()
+            if is_list.any():
+                matrix[is_list, j] = (
+                    values[is_list].map(is_missing_field).to_numpy()
+                )
+    return pd.DataFrame(matrix, columns=columns)
+
+def completeness_rates(missing) -> dict:
+    'Per-field and per-branch completeness rates of a missingness matrix.'
+    field_rates = 1 - missing.mean()
+    branches = missing.columns.str.split('__').str[0]
+    branch_missing = missing.T.groupby(branches.values, sort=False)
+    branch_rates = pd.DataFrame({
+        'field_completeness': field_rates.groupby(branches.values, sort=False).mean(),
+        'complete_files': 1 - branch_missing.any().T.mean()
+    })
+    return {'fields': field_rates, 'branches': branch_rates}
+
+
+# Feature gate
+def count_missing_features(feature_matrix, columns=None) -> np.ndarray:
+    'Count missing (NaN or -1) features per row, optionally over some columns.'
+    feature_matrix = np.asarray(feature_matrix, dtype=float)
+    if columns is not None:
+        feature_matrix = feature_matrix[:, columns]
+    return (np.isnan(feature_matrix) | (feature_matrix == -1)).sum(axis=1)
+
+def scorable_mask(feature_matrix, max_missing=MAX_MISSING_FEATURES,
+                  columns=None) -> np.ndarray:
+    'Mask of rows with few enough missing features to be scored.'
+    return count_missing_features(feature_matrix, columns) < max_missing
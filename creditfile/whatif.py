@@ -0,0 +1,79 @@
+# Created 2026-10-19
+
+
+from .featurize import (
+    MODEL_FEATURES,
+    AMORTIZATION_INTEREST,
+    prepare_feature_matrix
+)
+from .loancalc import Loan
+from .validate import scorable_mask
+from .score import ACCEPTABLE_SCORE, make_credit_scores
+
+import numpy as np
+
+
+# Constants
+FEATURE_INDEX = {name: i for i, name in enumerate(MODEL_FEATURES)}
+
+
+# Loan structuring
+def make_loan_grid(features, loan_amounts, loan_terms, loan_downpayments,
+                   interest=AMORTIZATION_INTEREST) -> np.ndarray:
+    'Tile one feature vector over a grid of loan structures.'
+    amounts, terms, downpayments = (
+        np.asarray(x, dtype=float).ravel() for x in np.meshgrid(
+            loan_amounts, loan_terms, loan_downpayments, indexing='ij'
+        )
+    )
+    grid = np.tile(np.asarray(features, dtype=float), (len(amounts), 1))
+    monthly_amortization = Loan.amort_calculator(amounts, interest, terms)
+    gross_income = grid[:, FEATURE_INDEX['num__gross_income']]
+    with np.errstate(divide='ignore', invalid='ignore'):
+        updates = {
+            'num__loan_amount': amounts,
+            'num__loan_term': terms,
+            'num__loan_downpayment': downpayments,
+            'num__monthly_amortization': monthly_amortization,
+            'num__amort_income_ratio': monthly_amortization / gross_income,
+            'num__loan_downpayment_ratio': downpayments / amounts
+        }
+    for name, values in updates.items():
+        grid[:, FEATURE_INDEX[name]] = values
+    return grid
+
+def score_loan_grid(normalized, loan_amounts, loan_terms,
+                    loan_downpayments=None, interest=AMORTIZATION_INTEREST,
+                    min_score=ACCEPTABLE_SCORE) -> dict:
+    '''Score an applicant over a grid of loan amounts, terms and downpayments.
+
+    Downpayments default to the one on file. Scores are NaN where the
+    applicant has too many missing features. The largest acceptable
+    amount is the largest with some term and downpayment scoring at least
+    min_score, or NaN if there is none.
+    '''
+    features = prepare_feature_matrix([normalized])[0]
+    if loan_downpayments is None:
+        loan_downpayments = [features[FEATURE_INDEX['num__loan_downpayment']]]
+    loan_amounts, loan_terms, loan_downpayments = (
+        np.atleast_1d(np.asarray(x, dtype=float))
+        for x in (loan_amounts, loan_terms, loan_downpayments)
+    )
+    grid = make_loan_grid(
+        features, loan_amounts, loan_terms, loan_downpayments, interest
+    )
+    shape = (len(loan_amounts), len(loan_terms), len(loan_downpayments))
+    scores = make_credit_scores(grid, scorable_mask(grid)).reshape(shape)
+    with np.errstate(invalid='ignore'):
+        acceptable = scores >= min_score
+    acceptable_amounts = loan_amounts[acceptable.any(axis=(1, 2))]
+    surface = {
+        'scores': scores,
+        'loan_amounts': loan_amounts,
+        'loan_terms': loan_terms,
+        'loan_downpayments': loan_downpayments,
+        'max_acceptable_amount': (
+            acceptable_amounts.max() if len(acceptable_amounts) else np.nan
+        )
+    }
+    return surface